@@ -1,6 +1,8 @@
 from litellm import completion
 from config import MODEL
-import json
+from dataclasses import dataclass
+import fastjsonschema
+import orjson
 
 schema = {
   "name": "OrderExtraction",
@@ -23,12 +25,12 @@ schema = {
         "items": {
           "type": "object",
           "properties": {
-            "sku":   {"type": "string"},
+            "sku":   {"type": ["string", "null"]},
             "name":  {"type": "string"},
             "qty":   {"type": "integer"},
             "price": {"type": "number"}
           },
-          "required": ["name", "qty", "price"],
+          "required": ["sku", "name", "qty", "price"],
           "additionalProperties": False
         },
         "minItems": 1
@@ -41,6 +43,58 @@ schema = {
   }
 }
 
+# Compile the validator once at import; fastjsonschema generates specialized code for it
+_validate_order = fastjsonschema.compile(schema["schema"])
+
+@dataclass(slots=True)
+class Customer:
+  name: str
+  email: str
+
+@dataclass(slots=True)
+class Item:
+  sku: str | None
+  name: str
+  qty: int
+  price: float
+
+@dataclass(slots=True)
+class Order:
+  order_id: str
+  customer: Customer
+  items: list[Item]
+  total: float
+  currency: str
+
+# Dataclass for each object node of the schema, keyed by property (or schema) name
+_CLASSES = {"OrderExtraction": Order, "customer": Customer, "items": Item}
+
+def _gen_expr(node, key, src, depth=0):
+  """Emit a Python expression that builds schema `node` (named `key`) from expression `src`."""
+  if node["type"] == "array":
+    var = f"_v{depth}"
+    return f"[{_gen_expr(node['items'], key, var, depth + 1)} for {var} in {src}]"
+  if node["type"] != "object":
+    return src
+  required = set(node.get("required", []))
+  args = []
+  for name, sub in node["properties"].items():
+    value = f"{src}[{name!r}]" if name in required else f"{src}.get({name!r})"
+    args.append(f"{name}={_gen_expr(sub, name, value, depth)}")
+  return f"{_CLASSES[key].__name__}({', '.join(args)})"
+
+# Generate a builder specialized to the schema: fixed keys, no per-key type checks
+_builder_src = f"def _build_order(d):\n  return {_gen_expr(schema['schema'], schema['name'], 'd')}\n"
+_builder_ns = {cls.__name__: cls for cls in _CLASSES.values()}
+exec(_builder_src, _builder_ns)
+_build_order = _builder_ns["_build_order"]
+
+def parse_order(raw):
+  """Parse the model's JSON text, validate it and build an Order."""
+  data = orjson.loads(raw)
+  _validate_order(data)
+  return _build_order(data)
+
 messages = [
   {"role":"system","content":"Return ONLY a JSON object matching the schema."},
   {"role":"user","content":"Order A-1029 by Sarah Johnson : 2x Water Bottle ($12.50 each), 1x Carrying Pouch ($5). Total $30."}
@@ -49,4 +103,13 @@ messages = [
 resp = completion(
   model=MODEL,
   messages=messages,
-  response_format={"type":"jso_
+  response_format={"type":"json_schema","json_schema":schema}
+)
+
+raw = resp.choices[0].message.content
+print("Raw response:")
+print(raw)
+
+order = parse_order(raw)
+print("\nParsed JSON:")
+print(orjson.dumps(order, option=orjson.OPT_INDENT_2).decode())
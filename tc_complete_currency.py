@@ -9,10 +9,61 @@ Keep INTERMEDIATE prints before each execution for teaching/debugging.
 """
 from typing import Dict, Any, List
 from dataclasses import dataclass
-import json
-from litellm import completion
+from functools import lru_cache
+from hashlib import blake2b
+from pathlib import Path
+import asyncio
+import atexit
+import importlib.util
+import inspect
+import itertools
+import math
+import os
+import re
+import sys
+import time
+import httpx
+import litellm
+import orjson
+import config
 from config import MODEL
 
+# Tool-planning turns run on SMALL_MODEL (if config defines one); MODEL writes the final answer
+SMALL_MODEL = getattr(config, "SMALL_MODEL", MODEL)
+
+# Share pooled connections across all turns and demos instead of a new TLS handshake per call.
+# Pooled async connections belong to the loop that opened them, and asyncio.run() closes its
+# loop on return; the blocking entry points therefore share one long-lived loop. Loop and
+# clients are created on first use and closed at exit; HTTP/2 is used when h2 is installed.
+HTTP_TIMEOUT = 60
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32)
+_LOOP: asyncio.AbstractEventLoop | None = None
+
+def _shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, creating it and the pooled LiteLLM clients on first use."""
+    global _LOOP
+    if _LOOP is None:
+        http2 = importlib.util.find_spec("h2") is not None
+        litellm.client_session = httpx.Client(http2=http2, timeout=HTTP_TIMEOUT, limits=_HTTP_LIMITS)
+        litellm.aclient_session = httpx.AsyncClient(http2=http2, timeout=HTTP_TIMEOUT, limits=_HTTP_LIMITS)
+        _LOOP = asyncio.new_event_loop()
+        atexit.register(_close_shared_loop)
+    return _LOOP
+
+def _close_shared_loop() -> None:
+    global _LOOP
+    if _LOOP is None:
+        return
+    litellm.client_session.close()
+    _LOOP.run_until_complete(litellm.aclient_session.aclose())
+    _LOOP.close()
+    litellm.client_session = litellm.aclient_session = None
+    _LOOP = None
+
+def _run_sync(coro):
+    """Run `coro` to completion on the shared event loop."""
+    return _shared_loop().run_until_complete(coro)
+
 # ===== Mock data =====
 RATE_TABLE: Dict[str, float] = {
     "USD->THB": 35.0,
@@ -25,32 +76,166 @@ RATE_TABLE: Dict[str, float] = {
 SUPPORTED = ["USD", "THB", "EUR", "JPY"]
 NAME_TO_ISO = {"baht": "THB", "dollar": "USD", "euro": "EUR", "yen": "JPY"}
 
-@dataclass
+def _build_rates() -> Dict[str, float]:
+    """
+    Close RATE_TABLE over identities, inverses and multi-hop paths
+    (Floyd-Warshall over log-rates) so any connected pair converts in one call.
+    Quoted rates are never overridden by derived ones.
+    """
+    log_rates = {(c, c): 0.0 for c in SUPPORTED}
+    for pair, rate in RATE_TABLE.items():
+        base, quote = pair.split("->")
+        log_rates[(base, quote)] = math.log(rate)
+    for (base, quote), lr in list(log_rates.items()):
+        log_rates.setdefault((quote, base), -lr)
+    for k, i, j in itertools.product(SUPPORTED, repeat=3):
+        if (i, j) not in log_rates and (i, k) in log_rates and (k, j) in log_rates:
+            log_rates[(i, j)] = log_rates[(i, k)] + log_rates[(k, j)]
+    rates = {f"{i}->{j}": round(math.exp(lr), 6) for (i, j), lr in log_rates.items()}
+    rates.update(RATE_TABLE)
+    return rates
+
+_RATES: Dict[str, float] = _build_rates()
+_SUPPORTED_PAIRS = sorted(_RATES)    # every pair convert accepts, derived ones included
+
+def _compile_rate_lookup(rates: Dict[str, float]):
+    """Generate `_fast_rate(base, quote)` as nested if-chains over the known ISO pairs (None on a miss)."""
+    by_base: Dict[str, Dict[str, float]] = {}
+    for pair, rate in rates.items():
+        b, q = pair.split("->")
+        by_base.setdefault(b, {})[q] = rate
+    lines = ["def _fast_rate(base, quote):"]
+    for b, quotes in by_base.items():
+        lines.append(f"    if base == {b!r}:")
+        for q, rate in quotes.items():
+            lines.append(f"        if quote == {q!r}: return {rate!r}")
+        lines.append("        return None")
+    lines.append("    return None")
+    ns: Dict[str, Any] = {}
+    exec("\n".join(lines), ns)
+    return ns["_fast_rate"]
+
+_fast_rate = _compile_rate_lookup(_RATES)
+
+# ISO codes and names, all keyed case-insensitively
+_RESOLVE: Dict[str, str] = {c.casefold(): c for c in SUPPORTED} | {
+    name.casefold(): iso for name, iso in NAME_TO_ISO.items()
+}
+
+@lru_cache(maxsize=128)
+def _resolve(name_or_code: str) -> str:
+    return _RESOLVE.get(name_or_code.strip().casefold(), "UNKNOWN")
+
+# A prompt that is exactly "convert <amount> <base> to <quote>" is answered locally, without an LLM turn
+_CONV_RE = re.compile(r"\s*convert\s+([\d.]+)\s+(\w+)\s+to\s+(\w+)\s*[.!?]?\s*", re.I)
+
+# ===== Tool loop =====
+MAX_TOKENS = 512
+KEEP_TURNS = 2    # tool-call turns resent to the model; older ones are elided
+HISTORY_ELIDED = {"role": "system", "content": "[earlier tool results omitted]"}
+
+# ===== Response cache (deterministic turns only) =====
+CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR", Path.home() / ".cache" / "litellm"))
+
+def _cache_key(**request) -> str:
+    return blake2b(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+def _cache_load(key: str) -> tuple[str | None, List["ToolCall"]] | None:
+    """Return a cached (content, tool_calls) turn; unreadable or malformed entries are misses."""
+    try:
+        turn = orjson.loads((CACHE_DIR / f"{key}.json").read_bytes())
+        return turn["content"], [ToolCall(**tc) for tc in turn["tool_calls"]]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        return None
+
+def _cache_store(key: str, turn: Dict[str, Any]) -> None:
+    """Best-effort write; an unwritable cache directory never fails the run."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_DIR / f"{key}.{os.getpid()}.tmp"
+        tmp.write_bytes(orjson.dumps(turn))
+        os.replace(tmp, CACHE_DIR / f"{key}.json")
+    except OSError:
+        pass
+
+# ===== Batch API =====
+BATCH_POLL_SECONDS = 30
+BATCH_DONE_STATUSES = ("completed", "failed", "expired", "cancelled")
+BATCH_PROVIDERS = ("openai", "azure", "hosted_vllm", "litellm_proxy", "mistral")  # OpenAI-format JSONL
+
+# ===== Tool schema generation =====
+_JSON_TYPES = {int: "integer", float: "number", str: "string", bool: "boolean", list: "array", dict: "object"}
+_ARGS_SECTION_RE = re.compile(r"^Args:\n((?:[ \t]+.*\n?)+)", re.M)
+_ARG_LINE_RE = re.compile(r"^[ \t]+(\w+):[ \t]*(.+)$", re.M)
+
+def build_schema(fn) -> dict:
+    """Build an OpenAI function schema from `fn`'s signature and Google-style docstring."""
+    doc = inspect.getdoc(fn) or ""
+    description = " ".join(doc.split("\n\n", 1)[0].split())
+    args_section = _ARGS_SECTION_RE.search(doc)
+    arg_docs = dict(_ARG_LINE_RE.findall(args_section[1])) if args_section else {}
+
+    properties: Dict[str, dict] = {}
+    required: List[str] = []
+    for name, param in inspect.signature(fn).parameters.items():
+        if name in ("self", "cls") or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        if param.annotation is param.empty:
+            raise TypeError(f"{fn.__name__}({name}): missing type annotation")
+        if param.annotation not in _JSON_TYPES:
+            raise TypeError(f"{fn.__name__}({name}): unsupported annotation {param.annotation!r}")
+        prop = {"type": _JSON_TYPES[param.annotation]}
+        if name in arg_docs:
+            prop["description"] = arg_docs[name]
+        properties[name] = prop
+        if param.default is inspect.Parameter.empty:
+            required.append(name)
+
+    parameters: Dict[str, Any] = {"type": "object", "properties": properties}
+    if required:
+        parameters["required"] = required
+    return {"name": fn.__name__, "description": description, "parameters": parameters}
+
+@dataclass(slots=True)
 class ToolCall:
     name: str
     arguments: str
+    id: str | None = None
 
 class CurrencyTools:
     """Currency utilities exposed as tools."""
 
+    TOOL_NAMES = ("list_supported", "resolve_currency", "convert")
+    _schemas: List[dict] | None = None
+
     # --- Tool 1: list_supported (PROVIDED) ---
     def list_supported(self) -> List[str]:
+        """Return supported currency ISO codes."""
         return SUPPORTED
 
     # --- Tool 2: resolve_currency (PROVIDED) ---
     def resolve_currency(self, name_or_code: str) -> str:
-        code = (name_or_code or "").strip().upper()
-        if code in SUPPORTED:
-            return code
-        return NAME_TO_ISO.get((name_or_code or "").strip().lower(), "UNKNOWN")
+        """
+        Map currency name or code to ISO code (e.g., 'baht'->'THB').
+
+        Args:
+            name_or_code: Currency name or ISO code.
+        """
+        return _resolve(name_or_code or "")
 
     # --- Tool 3: convert (YOU implement) ---
     def convert(self, amount: float, base: str, quote: str) -> Dict[str, Any]:
         """
-        Use RATE_TABLE to compute result.
-        Return dict like: {"amount":..., "base":..., "quote":..., "rate":..., "converted":...}
-        If missing rate -> return {"error": f"No rate for {base}->{quote}"}
-        Also accept non-ISO names (resolve first).
+        Convert amount from base to quote using fixed RATE_TABLE.
+
+        Args:
+            amount: Amount in the base currency.
+            base: Base currency name or ISO code (resolved first).
+            quote: Quote currency name or ISO code (resolved first).
+
+        Returns:
+            {"amount":..., "base":..., "quote":..., "rate":..., "converted":...}
+            or {"error": ...} for an invalid amount, unknown currency or missing rate.
         """
         # sanitize & resolve
         try:
@@ -58,18 +243,23 @@ class CurrencyTools:
         except Exception:
             return {"error": f"Invalid amount: {amount}"}
 
-        base_resolved = self.resolve_currency(base)
-        quote_resolved = self.resolve_currency(quote)
-        if base_resolved == "UNKNOWN" or quote_resolved == "UNKNOWN":
-            return {
-                "error": "UNKNOWN_CURRENCY",
-                "hint": {"supported": SUPPORTED, "base": base, "quote": quote}
-            }
+        # exact ISO codes hit the generated branch chain: no resolving, no dict lookup
+        rate = _fast_rate(base, quote)
+        if rate is not None:
+            base_resolved, quote_resolved = base, quote
+        else:
+            base_resolved = self.resolve_currency(base)
+            quote_resolved = self.resolve_currency(quote)
+            if base_resolved == "UNKNOWN" or quote_resolved == "UNKNOWN":
+                return {
+                    "error": "UNKNOWN_CURRENCY",
+                    "hint": {"supported": SUPPORTED, "base": base, "quote": quote}
+                }
 
-        pair = f"{base_resolved}->{quote_resolved}"
-        rate = RATE_TABLE.get(pair)
-        if rate is None:
-            return {"error": f"No rate for {pair}", "supported_pairs": sorted(RATE_TABLE.keys())}
+            pair = f"{base_resolved}->{quote_resolved}"
+            rate = _RATES.get(pair)
+            if rate is None:
+                return {"error": f"No rate for {pair}", "supported_pairs": _SUPPORTED_PAIRS}
 
         converted = round(amt * rate, 4)
         return {
@@ -82,44 +272,19 @@ class CurrencyTools:
 
     @classmethod
     def get_schemas(cls) -> List[dict]:
-        """Return tool schemas (OpenAI-compatible)."""
-        return [
-            # 1) list_supported - schema COMPLETE
-            {
-                "name": "list_supported",
-                "description": "Return supported currency ISO codes",
-                "parameters": {"type": "object", "properties": {}},
-            },
-            # 2) resolve_currency - schema COMPLETE
-            {
-                "name": "resolve_currency",
-                "description": "Map currency name or code to ISO code (e.g., 'baht'->'THB')",
-                "parameters": {
-                    "type": "object",
-                    "properties": {"name_or_code": {"type": "string"}},
-                    "required": ["name_or_code"],
-                },
-            },
-            # 3) convert - COMPLETED SCHEMA
-            {
-                "name": "convert",
-                "description": "Convert amount from base to quote using fixed RATE_TABLE",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "amount": {"type": "number"},
-                        "base":   {"type": "string"},
-                        "quote":  {"type": "string"}
-                    },
-                    "required": ["amount", "base", "quote"]
-                }
-            }
-        ]
+        """Return tool schemas (OpenAI-compatible), generated once from the tool signatures."""
+        if cls._schemas is None:
+            cls._schemas = [
+                {"type": "function", "function": build_schema(getattr(cls, name))}
+                for name in cls.TOOL_NAMES
+            ]
+        return cls._schemas
 
 class ToolExecutor:
     def __init__(self):
         self.tools = {}
         self.tool_schemas: List[dict] = []
+        self._memo_convert = lru_cache(maxsize=128)(self._convert)
 
     def register_tool(self, name: str, func, schema: dict):
         self.tools[name] = func
@@ -127,70 +292,331 @@ class ToolExecutor:
 
     def register_tools(self, tool_obj):
         for schema in tool_obj.get_schemas():
-            name = schema["name"]
+            name = schema["function"]["name"]
             if not hasattr(tool_obj, name):
                 continue
             self.register_tool(name, getattr(tool_obj, name), schema)
 
-    def run(self, user_text: str, model: str = MODEL, max_turns: int = 6, temperature: float = 0.2):
+    def call_tool(self, name: str, arguments: str | None) -> Any:
+        """Execute one registered tool from its JSON-encoded arguments."""
+        try:
+            args = orjson.loads(arguments or "{}")
+            if args:
+                return self.tools[name](**args)
+            return self.tools[name]()
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _convert(self, amount: float, base: str, quote: str) -> Dict[str, Any]:
+        return self.tools["convert"](amount=amount, base=base, quote=quote)
+
+    def try_fast_path(self, user_text: str, prefix: str | None = None) -> Dict[str, Any] | None:
+        """
+        Resolve plain conversion requests with the convert tool directly; None -> ask the LLM.
+        Unless `prefix` is None, the usual INTERMEDIATE block is printed before the tool runs.
+        """
+        m = _CONV_RE.fullmatch(user_text)
+        if m is None or "convert" not in self.tools:
+            return None
+        try:
+            amount = float(m[1])
+        except ValueError:
+            return None
+        if prefix is not None:
+            # INTERMEDIATE print (teaching/debugging)
+            print(f"{prefix}=== INTERMEDIATE (turn 1, local) ===")
+            print(f"{prefix}name:", "convert")
+            print(f"{prefix}arguments:", orjson.dumps({"amount": amount, "base": m[2], "quote": m[3]}).decode())
+        result = self._memo_convert(amount, m[2], m[3])
+        return None if "error" in result else result
+
+    def call_tool_encoded(self, name: str, arguments: str | None) -> str:
+        """`call_tool`, with the result serialized once (in the worker thread) as message content."""
+        return orjson.dumps(self.call_tool(name, arguments)).decode()
+
+    def run(self, user_text: str, **kwargs):
+        """Blocking wrapper around `arun` for single conversations."""
+        return _run_sync(self.arun(user_text, **kwargs))
+
+    async def arun(self, user_text: str, model: str = MODEL, max_turns: int = 6, temperature: float = 0.0,
+                   max_tokens: int = MAX_TOKENS, keep_turns: int = KEEP_TURNS,
+                   planner_model: str = SMALL_MODEL, first_message=None, tag: str = "", live: bool = True):
+        """
+        Run the tool loop; `first_message` replaces the turn-1 completion (e.g. from a batch).
+        `live` streams the answer token by token; otherwise it is printed as one whole line.
+        Tool-call turns run on `planner_model`; if that differs from `model`, planning runs at
+        temperature 0 and `model` writes the final answer at `temperature` from the gathered
+        tool results. Otherwise every turn uses `temperature`.
+        Only the last `keep_turns` tool-call turns are resent to the model.
+        Once run()/run_batch() have set up the pooled HTTP clients, await this only on the
+        shared loop (via _run_sync); those clients cannot be reused across asyncio.run() calls.
+        """
+        prefix = f"[{tag}] " if tag else ""
+        fast = self.try_fast_path(user_text, prefix)
+        if fast is not None:
+            content = f"{fast['amount']} {fast['base']} = {fast['converted']} {fast['quote']}"
+            print(f"{prefix}FINAL:", content)
+            return content
+
+        planner_answers = planner_model == model
+        planner_temperature = temperature if planner_answers else 0.0
         messages = [{"role": "user", "content": user_text}]
         for turn in range(1, max_turns + 1):
-            resp = completion(
-                model=model,
-                messages=messages,
-                functions=self.tool_schemas,       # OpenAI-style
-                function_call="auto",
-                temperature=temperature
-            )
-            msg = resp.choices[0].message
-            fc: ToolCall | None = getattr(msg, "function_call", None)
-            if not fc:
-                # Final answer from model
-                print("FINAL:", getattr(msg, "content", None) or msg.get("content"))
-                break
+            if turn == 1 and first_message is not None:
+                content, tool_calls = self._from_message(first_message)
+                if not tool_calls and planner_answers:
+                    print(f"{prefix}FINAL:", content)
+            else:
+                content, tool_calls = await self._aturn(messages, planner_model, planner_temperature,
+                                                        max_tokens, prefix, echo=planner_answers, live=live)
+            if not tool_calls:
+                if not planner_answers:
+                    # Final synthesis on the large model, no further tool use
+                    content, _ = await self._aturn(messages, model, temperature, max_tokens, prefix,
+                                                   tool_choice="none", live=live)
+                return content
 
             # INTERMEDIATE print (teaching/debugging)
-            print(f"=== INTERMEDIATE (turn {turn}) ===")
-            print("name:", getattr(fc, "name", None))
-            print("arguments:", getattr(fc, "arguments", None))
-
-            # Execute tool
-            try:
-                args = json.loads(getattr(fc, "arguments", "{}") or "{}")
-                name = getattr(fc, "name", None)
-                if args:
-                    result = self.tools[name](**args)
-                else:
-                    result = self.tools[name]()
-            except Exception as e:
-                result = {"error": str(e)}
-
-            # Return tool result back to model
+            print(f"{prefix}=== INTERMEDIATE (turn {turn}) ===")
+            for tc in tool_calls:
+                print(f"{prefix}name:", tc.name)
+                print(f"{prefix}arguments:", tc.arguments)
+
+            # Execute independent tool calls concurrently, off the event loop
+            contents = await asyncio.gather(*(
+                asyncio.to_thread(self.call_tool_encoded, tc.name, tc.arguments)
+                for tc in tool_calls
+            ))
+
+            # Return tool results back to model
             messages.append({
                 "role": "assistant",
                 "content": None,
-                "function_call": {
-                    "name": getattr(fc, "name", None),
-                    "arguments": getattr(fc, "arguments", "{}")
-                }
-            })
-            messages.append({
-                "role": "function",
-                "name": getattr(fc, "name", None),
-                "content": json.dumps(result, ensure_ascii=False)
+                "tool_calls": [
+                    {
+                        "id": tc.id,
+                        "type": "function",
+                        "function": {"name": tc.name, "arguments": tc.arguments}
+                    }
+                    for tc in tool_calls
+                ]
             })
+            for tc, encoded in zip(tool_calls, contents):
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tc.id,
+                    "content": encoded
+                })
+            self._trim_history(messages, keep_turns)
+        return None
+
+    async def _aturn(self, messages: List[dict], model: str, temperature: float, max_tokens: int,
+                     prefix: str = "", echo: bool = True, tool_choice: str = "auto",
+                     live: bool = True) -> tuple[str | None, List[ToolCall]]:
+        """
+        One streamed LLM turn; `echo` prints a tool-free answer (token by token when `live`).
+        Temperature-0 turns are replayed from the disk cache when possible.
+        """
+        key = None
+        if temperature == 0:
+            key = _cache_key(model=model, messages=messages, tools=self.tool_schemas, tool_choice=tool_choice,
+                             temperature=temperature, max_tokens=max_tokens)
+            cached = _cache_load(key)
+            if cached is not None:
+                content, tool_calls = cached
+                if echo and not tool_calls:
+                    print(f"{prefix}FINAL:", content)
+                return content, tool_calls
+
+        resp = await litellm.acompletion(
+            model=model,
+            messages=messages,
+            tools=self.tool_schemas,           # OpenAI-style
+            tool_choice=tool_choice,
+            parallel_tool_calls=True,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        content, tool_calls = await self._collect_stream(resp, prefix if echo else None, live=live)
+        if key is not None:
+            _cache_store(key, {"content": content, "tool_calls": tool_calls})
+        return content, tool_calls
+
+    @staticmethod
+    def _trim_history(messages: List[dict], keep_turns: int) -> None:
+        """Replace all but the last `keep_turns` tool-call turns (assistant + tool results) with a marker."""
+        starts = [i for i, m in enumerate(messages) if m.get("tool_calls")]
+        if keep_turns < 1 or len(starts) <= keep_turns:
+            return
+        messages[1:starts[-keep_turns]] = [dict(HISTORY_ELIDED)]
+
+    @staticmethod
+    def _from_message(msg) -> tuple[str | None, List[ToolCall]]:
+        """Split a complete (non-streamed) assistant message into content and tool calls."""
+        tool_calls = [
+            ToolCall(name=tc.function.name, arguments=tc.function.arguments or "{}", id=tc.id)
+            for tc in msg.tool_calls or []
+        ]
+        return msg.content, tool_calls
+
+    @staticmethod
+    async def _collect_stream(resp, prefix: str | None = "",
+                              live: bool = True) -> tuple[str | None, List[ToolCall]]:
+        """
+        Consume a streamed completion, accumulating content and tool-call deltas by index.
+        Unless `prefix` is None, a tool-free answer is printed as FINAL:. With `live`, content that
+        arrives before any tool-call delta is written token by token; if a tool call follows
+        anyway, that line is closed and marked as not final.
+        """
+        parts: List[str] = []
+        calls: Dict[int, ToolCall] = {}
+        streaming = False       # content is being written live
+        async for chunk in resp:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            for tc in delta.tool_calls or []:
+                if streaming:
+                    sys.stdout.write("\n")
+                    print(f"{prefix}(not final: tool call follows)")
+                    streaming = False
+                call = calls.setdefault(tc.index, ToolCall(name="", arguments=""))
+                if tc.id:
+                    call.id = tc.id
+                if tc.function.name:
+                    call.name = tc.function.name
+                if tc.function.arguments:
+                    call.arguments += tc.function.arguments
+            if delta.content:
+                if live and prefix is not None and not calls:
+                    if not streaming:
+                        sys.stdout.write(f"{prefix}FINAL: ")
+                        streaming = True
+                    sys.stdout.write(delta.content)
+                    sys.stdout.flush()
+                parts.append(delta.content)
+        content = "".join(parts) or None
+        tool_calls = [calls[i] for i in sorted(calls)]
+        for call in tool_calls:
+            call.arguments = call.arguments or "{}"
+
+        if streaming:
+            sys.stdout.write("\n")
+        elif prefix is not None and not tool_calls:
+            print(f"{prefix}FINAL:", content)
+        return content, tool_calls
+
+    async def arun_many(self, prompts: List[str], first_messages: List | None = None, **kwargs):
+        """
+        Run one conversation per prompt concurrently on a single event loop.
+        Answers are printed as whole lines so concurrent demos don't interleave mid-line.
+        """
+        first_messages = first_messages or [None] * len(prompts)
+        kwargs.setdefault("live", False)
+        return await asyncio.gather(*(
+            self.arun(prompt, first_message=first, tag=f"Demo {i + 1}", **kwargs)
+            for i, (prompt, first) in enumerate(zip(prompts, first_messages))
+        ))
+
+    def run_batch(self, prompts: List[str], model: str = MODEL, temperature: float = 0.0,
+                  planner_model: str = SMALL_MODEL, poll_seconds: float = BATCH_POLL_SECONDS):
+        """
+        Submit the first turn of every prompt as ONE Batch API job (/v1/batches),
+        then finish each conversation with the regular tool loop.
+        Batches complete within 24h at a discounted price; the planner model's provider
+        must accept OpenAI-format batch files (see BATCH_PROVIDERS).
+        """
+        _shared_loop()     # set up the pooled clients before the synchronous file/batch calls
+        batch_model, provider, _, _ = litellm.get_llm_provider(planner_model)
+        if provider not in BATCH_PROVIDERS:
+            raise ValueError(f"Batch mode is not supported for provider {provider!r} ({planner_model})")
+
+        # Prompts the local fast path answers are not worth a batch slot
+        pending = [i for i, prompt in enumerate(prompts) if self.try_fast_path(prompt) is None]
+        first_messages = {}
+        if pending:
+            first_messages = self._submit_batch(
+                [(f"demo-{i}", prompts[i]) for i in pending], batch_model, provider, poll_seconds,
+                temperature=temperature if planner_model == model else 0.0,
+            )
+
+        # Finish all runs concurrently; failed batch lines fall back to a live turn 1
+        return _run_sync(self.arun_many(
+            prompts,
+            first_messages=[first_messages.get(f"demo-{i}") for i in range(len(prompts))],
+            model=model,
+            temperature=temperature,
+            planner_model=planner_model,
+        ))
+
+    def _submit_batch(self, requests: List[tuple], batch_model: str, provider: str,
+                      poll_seconds: float, temperature: float = 0.0) -> Dict[str, Any]:
+        """Run (custom_id, prompt) first turns as one batch job; return turn-1 messages by custom_id."""
+        lines = []
+        for custom_id, prompt in requests:
+            lines.append(orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": batch_model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "tools": self.tool_schemas,
+                    "tool_choice": "auto",
+                    "parallel_tool_calls": True,
+                    "temperature": temperature,
+                    "max_tokens": MAX_TOKENS,
+                },
+            }))
+
+        batch_file = litellm.create_file(
+            file=("demo_batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+            custom_llm_provider=provider,
+        )
+        batch = litellm.create_batch(
+            completion_window="24h",
+            endpoint="/v1/chat/completions",
+            input_file_id=batch_file.id,
+            custom_llm_provider=provider,
+        )
+        print(f"Submitted batch {batch.id} ({len(requests)} requests)")
+        while batch.status not in BATCH_DONE_STATUSES:
+            time.sleep(poll_seconds)
+            batch = litellm.retrieve_batch(batch_id=batch.id, custom_llm_provider=provider)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+        # Collect turn-1 messages by custom_id (output order is not guaranteed);
+        # a batch whose lines all failed completes without an output file
+        first_messages = {}
+        output_lines = []
+        if batch.output_file_id:
+            output = litellm.file_content(file_id=batch.output_file_id, custom_llm_provider=provider)
+            output_lines = output.text.splitlines()
+        for line in output_lines:
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            first_messages[record["custom_id"]] = litellm.ModelResponse(**response["body"]).choices[0].message
+        return first_messages
+
+DEMO_PROMPTS = [
+    "Convert 100 USD to THB",
+    "Convert 250 baht to euros",
+    "Convert 10 ABC to USD",    # unknown code
+]
 
 if __name__ == "__main__":
     tools = CurrencyTools()
     ex = ToolExecutor()
     ex.register_tools(tools)
 
-    print("\n--- Demo 1 ---")
-    ex.run("Convert 100 USD to THB")
-
-    print("\n--- Demo 2 ---")
-    ex.run("Convert 250 baht to euros")
-
-    print("\n--- Demo 3 (unknown code) ---")
-    ex.run("Convert 10 ABC to USD")
-
+    if "--batch" in sys.argv:
+        ex.run_batch(DEMO_PROMPTS)
+    else:
+        _run_sync(ex.arun_many(DEMO_PROMPTS))